@@ -4,35 +4,40 @@ This program collects news from RSS sources, filters them, and adds location inf
 """
 
 import asyncio
-import json
+import orjson
 import time
 import logging
 import os
 from datetime import datetime
 
-# Create required directories first
-os.makedirs("logs", exist_ok=True)
-os.makedirs("results", exist_ok=True)
-
-# Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(f"logs/news_processor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
-        logging.StreamHandler()
-    ]
-)
-
-# Modules
-from scraping.rss_scraper import process_rss_feeds
-from modules.news_filter import remove_duplicates_lsh
-from modules.location_extractor import add_locations
+def setup_logging():
+    """
+    Create the output directories and log to a new file per run.
+    """
+    # Create required directories first
+    os.makedirs("logs", exist_ok=True)
+    os.makedirs("results", exist_ok=True)
+    
+    # Logging configuration
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(f"logs/news_processor_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"),
+            logging.StreamHandler()
+        ]
+    )
 
 async def main():
     """
     Main program function. Collects, filters, and adds location to news in sequence.
     """
+    # Modules, imported here so that feed parsing workers, which re-import
+    # this script, don't load the models or open another log file
+    from scraping.rss_scraper import process_rss_feeds
+    from modules.news_filter import remove_duplicates_lsh
+    from modules.location_extractor import add_locations
+    
     total_start_time = time.time()
     
     # ----- STEP 1: RSS NEWS COLLECTION -----
@@ -90,8 +95,8 @@ async def main():
     result_file = f"results/processed_news_{timestamp}.json"
     
     try:
-        with open(result_file, "w", encoding="utf-8") as f:
-            json.dump(news_with_locations, f, ensure_ascii=False, indent=2)
+        with open(result_file, "wb") as f:
+            f.write(orjson.dumps(news_with_locations, option=orjson.OPT_INDENT_2))
         logging.info(f"Processed news saved to: {result_file}")
     except Exception as e:
         logging.error(f"Error saving results: {str(e)}")
@@ -116,6 +121,7 @@ async def main():
             logging.info("")
 
 if __name__ == "__main__":
+    setup_logging()
     try:
         logging.info("=== RSS NEWS TRACKING SYSTEM STARTING ===")
         asyncio.run(main())
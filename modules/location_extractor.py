@@ -1,11 +1,11 @@
 """
 Simple location extractor that works directly with spaCy without async complexity
 """
+import os
 import time
 import logging
+import functools
 from typing import List, Dict, Any, Optional
-import spacy
-import re
 
 # Configure logging
 logging.basicConfig(
@@ -13,14 +13,53 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# Load spaCy for NER
 try:
-    nlp = spacy.load("en_core_web_sm", disable=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer"])
+    import spacy
     SPACY_AVAILABLE = True
 except ImportError:
     SPACY_AVAILABLE = False
     logging.warning("spaCy not available - install with: pip install spacy && python -m spacy download en_core_web_sm")
 
+@functools.lru_cache(maxsize=1)
+def _get_nlp():
+    """
+    Load spaCy for NER on first use, once per process
+    """
+    # Keep tok2vec, the NER component depends on it
+    return spacy.load("en_core_web_sm", exclude=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+
+# Number of texts spaCy processes per batch in nlp.pipe
+SPACY_BATCH_SIZE = int(os.environ.get("SPACY_BATCH_SIZE", "64"))
+
+# Process only the first 500 chars for speed
+MAX_TEXT_LEN = 500
+
+# Texts shorter than this (e.g. ". " from an empty title and summary) are not worth running NER on
+MIN_TEXT_LEN = 5
+
+def _first_location(doc) -> Optional[str]:
+    """
+    Return the first GPE (country, city) or LOC (location) entity of a parsed doc
+    """
+    for ent in doc.ents:
+        if ent.label_ in ["GPE", "LOC"]:
+            return ent.text
+    return None
+
+def _prepare_text(text: str) -> Optional[str]:
+    """
+    Strip and truncate text for NER, or return None if there is nothing to analyze
+    """
+    text = text.strip()
+    if len(text) < MIN_TEXT_LEN:
+        return None
+    
+    # Truncate at a word boundary so spaCy doesn't see a partial word
+    if len(text) > MAX_TEXT_LEN:
+        text = text[:MAX_TEXT_LEN].rsplit(" ", 1)[0]
+    
+    return text
+
 def extract_location_from_text(text: str) -> Optional[str]:
     """
     Extract location from text using spaCy NER
@@ -28,32 +67,33 @@ def extract_location_from_text(text: str) -> Optional[str]:
     if not SPACY_AVAILABLE or not text:
         return None
     
-    # Process only the first 500 chars for speed
-    if len(text) > 500:
-        text = text[:500]
+    text = _prepare_text(text)
+    if text is None:
+        return None
     
     # Process the text with spaCy
-    doc = nlp(text)
+    doc = _get_nlp()(text)
     
-    # Find the first GPE (country, city) or LOC (location) entity
-    for ent in doc.ents:
-        if ent.label_ in ["GPE", "LOC"]:
-            return ent.text
+    return _first_location(doc)
+
+def extract_locations(texts: List[str]) -> List[Optional[str]]:
+    """
+    Extract locations from many texts at once using batched spaCy NER
+    """
+    locations = [None] * len(texts)
+    if not SPACY_AVAILABLE:
+        return locations
     
-    # Backup method: Try to find location patterns
-    # Common location patterns in financial news
-    location_patterns = [
-        r'in ([A-Z][a-z]+)',  # "in London", "in Tokyo"
-        r'from ([A-Z][a-z]+)',  # "from Washington"
-        r'at ([A-Z][a-z]+)',  # "at Frankfurt"
-    ]
+    # Only texts with something to analyze go through NER
+    prepared = [_prepare_text(text) if text else None for text in texts]
+    indices = [idx for idx, text in enumerate(prepared) if text is not None]
     
-    for pattern in location_patterns:
-        matches = re.findall(pattern, text)
-        if matches:
-            return matches[0]
+    # Run NER over all texts in batches instead of one nlp() call per item
+    docs = _get_nlp().pipe((prepared[idx] for idx in indices), batch_size=SPACY_BATCH_SIZE, n_process=1)
+    for idx, doc in zip(indices, docs):
+        locations[idx] = _first_location(doc)
     
-    return None
+    return locations
 
 def add_locations(news_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
@@ -68,16 +108,13 @@ def add_locations(news_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         logging.error("spaCy is required for location extraction")
         return news_list
     
-    # Process each news item
-    for news in news_list:
-        # Skip if already has location
-        if news.get("location"):
-            continue
-        
-        # Extract location from title and summary
-        combined_text = f"{news.get('title', '')}. {news.get('summary', '')}"
-        location = extract_location_from_text(combined_text)
-        news["location"] = location
+    # Only news items without a location need NER
+    needs = [news for news in news_list if not news.get("location")]
+    
+    if needs:
+        texts = [f"{news.get('title', '')}. {news.get('summary', '')}" for news in needs]
+        for news, location in zip(needs, extract_locations(texts)):
+            news["location"] = location
     
     # Count news with locations
     location_count = sum(1 for item in news_list if item.get("location"))
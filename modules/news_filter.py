@@ -1,9 +1,13 @@
 """
 News filtering module with duplicate detection
 """
-from transformers import pipeline
-from sklearn.metrics.pairwise import cosine_similarity
+from sentence_transformers import SentenceTransformer
+import functools
 import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+import torch
+import os
 import time
 import logging
 
@@ -13,71 +17,145 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-# Initialize BERT embedder
-try:
-    embedder = pipeline("feature-extraction", model="bert-base-uncased", device=0)
-    logging.info("Device set to use cuda:0")
-except RuntimeError:
-    embedder = pipeline("feature-extraction", model="bert-base-uncased", device=-1)
-    logging.info("CUDA unavailable, using CPU")
+# Sentence embedding model (mean pooling is done inside the model)
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384
 
-def get_embedding(text, batch_size=8, max_length=512):
+# Signatures are packed into uint64, one bit per hash function
+MAX_NUM_HASHES = 64
+
+# ONNX export of the model used for CPU inference
+EMBEDDING_ONNX_FILE = os.environ.get("EMBEDDING_ONNX_FILE", "onnx/model.onnx")
+
+@functools.lru_cache(maxsize=1)
+def _get_embedder():
+    """
+    Load the MiniLM embedder on first use, once per process
     """
-    Get BERT embeddings for text.
+    if torch.cuda.is_available():
+        # fp16 halves memory traffic and runs on tensor cores
+        embedder = SentenceTransformer(EMBEDDING_MODEL, device="cuda").half()
+        logging.info("Device set to use cuda (fp16)")
+        return embedder
+    
+    # ONNX Runtime is considerably faster than PyTorch on CPU; set
+    # EMBEDDING_ONNX_FILE to e.g. onnx/model_qint8_avx512_vnni.onnx for an int8 model
+    try:
+        embedder = SentenceTransformer(
+            EMBEDDING_MODEL,
+            device="cpu",
+            backend="onnx",
+            model_kwargs={
+                "file_name": EMBEDDING_ONNX_FILE,
+                "provider": "CPUExecutionProvider",
+            },
+        )
+        logging.info(f"CUDA unavailable, using CPU with ONNX Runtime ({EMBEDDING_ONNX_FILE})")
+    except Exception as e:
+        logging.warning(f"ONNX Runtime backend unavailable ({e}), falling back to PyTorch")
+        embedder = SentenceTransformer(EMBEDDING_MODEL, device="cpu")
+        logging.info("CUDA unavailable, using CPU")
+    return embedder
+
+def get_embedding(text, batch_size=64):
+    """
+    Get sentence embeddings for text.
     
     Args:
         text: List of text strings to embed
         batch_size: Batch size for processing
-        max_length: Maximum sequence length (BERT max is 512)
         
     Returns:
-        List of embeddings
+        Array of L2-normalized embeddings, one row per text
     """
-    # Truncate texts to avoid exceeding BERT's token limit
-    truncated_texts = []
-    for t in text:
-        # Rough estimate: assume average token is ~4 chars, limit to ~480 tokens to be safe
-        # This gives us ~1920 chars (allowing some room for tokenization differences)
-        if len(t) > 1900:
-            truncated_texts.append(t[:1900] + "...")
-        else:
-            truncated_texts.append(t)
-    
     try:
-        features = embedder(truncated_texts, batch_size=batch_size, truncation=True, max_length=max_length)
-        embeddings = [np.mean(np.array(feature[0]), axis=0) for feature in features]
-        return embeddings
+        # Batches are padded to their longest text and truncated to the model's max sequence length
+        with torch.inference_mode():
+            embeddings = _get_embedder().encode(
+                text,
+                batch_size=batch_size,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+            )
+        return embeddings.astype(np.float32, copy=False)
     except Exception as e:
         logging.error(f"Error during embedding: {e}")
         raise
 
-def compute_lsh_hash(embedding, random_vectors):
+@functools.lru_cache(maxsize=None)
+def get_random_vectors(num_hashes):
     """
-    Compute Locality-Sensitive Hashing (LSH) hash for an embedding.
+    Get the random projection vectors for LSH, generated once per num_hashes.
+    
+    SimHash needs hyperplanes drawn from a zero-mean Gaussian; uniform [0, 1)
+    vectors all point into the same orthant and make the hash bits correlated.
     
     Args:
-        embedding: Vector embedding of a news item
-        random_vectors: Random projection vectors
+        num_hashes: Number of hash functions
         
     Returns:
-        Binary hash string
+        float32 matrix of shape (num_hashes, EMBEDDING_DIM)
     """
-    projection = np.dot(random_vectors, embedding)
-    binary_hash = ''.join(np.where(projection >= 0, '1', '0'))
-    return binary_hash
+    rng = np.random.default_rng(48)  # For reproducibility
+    random_vectors = rng.standard_normal((num_hashes, EMBEDDING_DIM)).astype(np.float32)
+    random_vectors.setflags(write=False)
+    return random_vectors
 
-def remove_duplicates_lsh(news_list, threshold=0.85, num_hashes=20):
+def compute_lsh_hash(embeddings, random_vectors):
+    """
+    Compute Locality-Sensitive Hashing (LSH) hashes for all embeddings at once.
+    
+    Args:
+        embeddings: float32 matrix of embeddings, one row per news item
+        random_vectors: float32 random projection vectors
+        
+    Returns:
+        Array of signatures with one sign bit per random vector, packed into integers
+    """
+    if len(random_vectors) > MAX_NUM_HASHES:
+        raise ValueError(f"At most {MAX_NUM_HASHES} random vectors fit in a signature, got {len(random_vectors)}")
+    
+    projections = embeddings @ random_vectors.T
+    bits = (projections >= 0).astype(np.uint64)
+    bit_weights = np.uint64(1) << np.arange(bits.shape[1], dtype=np.uint64)
+    return bits @ bit_weights
+
+def band_keys(signature, num_bands, rows):
+    """
+    Split an LSH signature into bands of bits.
+    
+    Args:
+        signature: Packed LSH signature
+        num_bands: Number of bands
+        rows: Number of bits per band
+        
+    Returns:
+        List of (band, band_bits) bucket keys
+    """
+    band_mask = (1 << rows) - 1
+    return [(band, (signature >> (band * rows)) & band_mask) for band in range(num_bands)]
+
+def remove_duplicates_lsh(news_list, threshold=0.85, num_hashes=60, num_bands=10):
     """
     Remove duplicate news using LSH and cosine similarity.
     
+    The LSH signature is split into bands; news items sharing any band
+    become candidates and are compared with cosine similarity.
+    
     Args:
         news_list: List of news items
         threshold: Similarity threshold (0.85 default)
         num_hashes: Number of hash functions
+        num_bands: Number of LSH bands (num_hashes / num_bands bits each)
         
     Returns:
         List of unique news items
     """
+    if not 0 < num_bands <= num_hashes <= MAX_NUM_HASHES:
+        raise ValueError(f"Expected 0 < num_bands <= num_hashes <= {MAX_NUM_HASHES}, got {num_bands} bands and {num_hashes} hashes")
+    if num_hashes % num_bands:
+        raise ValueError(f"num_hashes ({num_hashes}) must be a multiple of num_bands ({num_bands})")
+    
     if not news_list:
         logging.warning("Empty news list provided to duplicate removal")
         return []
@@ -85,9 +163,7 @@ def remove_duplicates_lsh(news_list, threshold=0.85, num_hashes=20):
     logging.info(f"Starting duplicate removal for {len(news_list)} news items...")
     start_time = time.time()
     
-    embedding_dim = 768  # BERT embedding dimension
-    np.random.seed(48)  # For reproducibility
-    random_vectors = np.random.rand(num_hashes, embedding_dim)
+    random_vectors = get_random_vectors(num_hashes)
     
     # Create text representations by combining title and summary
     texts = []
@@ -106,36 +182,44 @@ def remove_duplicates_lsh(news_list, threshold=0.85, num_hashes=20):
         logging.error(f"Failed to get embeddings: {e}")
         return []  # Return empty list on error
     
-    # Assign embeddings and compute hashes
-    for news, embedding in zip(news_list, embeddings):
-        news["embedding"] = embedding
-        news["lsh_hash"] = compute_lsh_hash(embedding, random_vectors)
+    # Rows are already L2-normalized float32, row i belongs to news_list[i]
+    signatures = compute_lsh_hash(embeddings, random_vectors)
     
-    # Group by hash bucket
+    # Group row indices by hash bucket, one bucket per (band, band bits)
+    rows = num_hashes // num_bands
     buckets = {}
-    for news in news_list:
-        key = news["lsh_hash"]
-        buckets.setdefault(key, []).append(news)
+    for idx, signature in enumerate(signatures):
+        for key in band_keys(int(signature), num_bands, rows):
+            buckets.setdefault(key, []).append(idx)
     
-    # Filter duplicates within each bucket
-    unique_news = []
+    # Link duplicate pairs found within each bucket
+    edge_rows = [np.empty(0, dtype=np.intp)]
+    edge_cols = [np.empty(0, dtype=np.intp)]
     for bucket in buckets.values():
-        bucket_unique = []
-        for news in bucket:
-            duplicate = False
-            for unique in bucket_unique:
-                sim = cosine_similarity([news["embedding"]], [unique["embedding"]])[0][0]
-                if sim >= threshold:
-                    duplicate = True
-                    break
-            if not duplicate:
-                bucket_unique.append(news)
-        unique_news.extend(bucket_unique)
-    
-    # Clean up by removing embedding and hash
-    for news in unique_news:
-        news.pop("embedding", None)
-        news.pop("lsh_hash", None)
+        if len(bucket) < 2:
+            continue
+        
+        # Cosine similarity of all pairs in the bucket with a single matmul
+        bucket = np.asarray(bucket, dtype=np.intp)
+        bucket_embeddings = embeddings[bucket]
+        similarities = bucket_embeddings @ bucket_embeddings.T
+        
+        i, j = np.nonzero(np.triu(similarities >= threshold, 1))
+        edge_rows.append(bucket[i])
+        edge_cols.append(bucket[j])
+    
+    # Each connected component of the similarity graph is one group of duplicates
+    edge_rows = np.concatenate(edge_rows)
+    edge_cols = np.concatenate(edge_cols)
+    graph = coo_matrix(
+        (np.ones(len(edge_rows), dtype=np.int8), (edge_rows, edge_cols)),
+        shape=(len(news_list), len(news_list)),
+    )
+    _, labels = connected_components(graph, directed=False)
+    
+    # Keep the first news item of each group
+    _, first_indices = np.unique(labels, return_index=True)
+    unique_news = [news_list[idx] for idx in np.sort(first_indices)]
     
     elapsed_time = time.time() - start_time
     logging.info(f"Removed {len(news_list) - len(unique_news)} duplicates in {elapsed_time:.2f} seconds")
@@ -148,10 +232,13 @@ def process_news():
     Main function to process news: filter duplicates and add locations.
     """
     # Import here to avoid circular imports
-    from scraping.rss_scraper import process_rss_feeds, news_list
+    from scraping.rss_scraper import process_rss_feeds
     from modules.location_extractor import add_locations
     import asyncio
     
+    # Collect news
+    news_list = asyncio.run(process_rss_feeds())
+    
     # Remove duplicates
     start_time = time.time()
     filtered_news = remove_duplicates_lsh(news_list)
@@ -165,11 +252,11 @@ def process_news():
 
 # If this file is run directly
 if __name__ == "__main__":
-    from scraping.rss_scraper import process_rss_feeds, news_list
+    from scraping.rss_scraper import process_rss_feeds
     import asyncio
     
     # Collect news
-    asyncio.run(process_rss_feeds())
+    news_list = asyncio.run(process_rss_feeds())
     
     # Filter duplicates
     processed_news = remove_duplicates_lsh(news_list)
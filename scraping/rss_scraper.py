@@ -4,12 +4,24 @@ RSS Feed Scraper Module optimized for financial news within the last hour
 
 import asyncio
 import aiohttp
-import json
+import calendar
+import contextlib
+import email.utils
+import io
+import orjson
+import os
 import feedparser
+from lxml import etree
 from datetime import datetime, timedelta, timezone
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
 import logging
+import multiprocessing
 import random
+import re
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from urllib.parse import urlparse
 
 # Configure logging
 logging.basicConfig(
@@ -19,10 +31,72 @@ logging.basicConfig(
 
 # Time window for recent news - 1 hour for financial prediction
 TIME_WINDOW = timedelta(hours=1)
-now = datetime.now(timezone.utc)
 
-# Global list to store news
-news_list = []
+# RSS sources configuration
+RSS_SOURCES_FILE = Path(__file__).resolve().parent.parent / "news" / "rss.json"
+
+# Directory of the on-disk feed caches, next to news/ so it doesn't depend on the working directory
+CACHE_DIR = RSS_SOURCES_FILE.parent.parent / "cache"
+
+# On-disk cache of ETag / Last-Modified validators for conditional feed requests
+ETAG_CACHE_FILE = CACHE_DIR / "etag_cache.json"
+ETAGS = {}
+
+# On-disk cache of failing feeds, skipped until their backoff expires
+FAIL_CACHE_FILE = CACHE_DIR / "fail_cache.json"
+FAIL_CACHE = {}
+FAIL_BACKOFF = 600  # Seconds to skip a feed after its first failure, doubled on each consecutive failure
+FAIL_MAX_BACKOFF = 6 * 3600
+
+# Retry policy for transient failures
+MAX_ATTEMPTS = 3
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_RETRY_DELAY = 8  # Cap of the exponential backoff, in seconds
+MAX_RETRY_AFTER = 30  # Longer Retry-After requests are not waited for in this run
+
+# Adaptive (AIMD) limit on the number of feeds fetched at the same time
+INITIAL_CONCURRENT_FEEDS = 32
+MIN_CONCURRENT_FEEDS = 4
+MAX_CONCURRENT_FEEDS = 64
+TARGET_LATENCY = 2.0  # Seconds, mean fetch latency below which the limit grows
+
+# Maximum number of feeds fetched from a single host at the same time
+MAX_FEEDS_PER_HOST = 8
+
+# Session-wide request timeout so one slow host doesn't stall the whole gather
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5, sock_read=10)
+
+# Hard per-attempt budget for downloading a feed, a backstop for the session timeout
+FEED_TIMEOUT = 20
+
+# Matches any HTML tag in feed summaries
+_TAG_RE = re.compile(r'<[^>]+>')
+
+# Namespaces of the core RSS 2.0 (none), RSS 1.0 and Atom entry elements
+_FEED_NAMESPACES = {None, "http://purl.org/rss/1.0/", "http://www.w3.org/2005/Atom"}
+
+# Entry child elements (by local name, extensions by full tag) and the fields they fill
+_ENTRY_FIELDS = {
+    "title": "title",
+    "description": "summary",
+    "summary": "summary",
+    "pubDate": "published",
+    "published": "published",
+    "{http://purl.org/dc/elements/1.1/}date": "published",
+    "updated": "updated",
+}
+
+# Start method of the feed parsing workers (feedparser holds the GIL). Forking
+# a process that already runs torch / ONNX Runtime thread pools can deadlock,
+# so workers are spawned; they only import this module and the main script.
+PARSE_START_METHOD = "spawn"
+
+# Headers sent with every feed request, the User-Agent is picked per session
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Referer": "https://www.google.com/"  # Sometimes helps with access
+}
 
 # List of user agents to rotate
 USER_AGENTS = [
@@ -33,138 +107,514 @@ USER_AGENTS = [
     "Mozilla/5.0 (iPhone; CPU iPhone OS 14_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/14.0 Mobile/15E148 Safari/604.1"
 ]
 
-async def fetch_feed(session, source_name, feed_url, attempt=1):
+def _parse_date(value):
+    """
+    Parse an RSS (RFC 822) or Atom (ISO 8601) date into a UTC struct_time
+    
+    Args:
+        value: Date string from the feed
+        
+    Returns:
+        time.struct_time in UTC, or None if the date can't be parsed
+    """
+    if not value:
+        return None
+    
+    try:
+        if value[:4].isdigit():
+            published_date = datetime.fromisoformat(value)
+        else:
+            published_date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    
+    if published_date.tzinfo is None:
+        published_date = published_date.replace(tzinfo=timezone.utc)
+    return published_date.utctimetuple()
+
+def _parse_entry(element):
+    """
+    Extract the fields used downstream from an RSS <item> or Atom <entry>
+    
+    Args:
+        element: lxml element of the item/entry
+        
+    Returns:
+        Entry dict with feedparser-compatible keys
+    """
+    entry = {}
+    permalink = None
+    for child in element:
+        # Skip comments and processing instructions
+        if not isinstance(child.tag, str):
+            continue
+        
+        # Extension elements such as media:title or itunes:summary must not shadow the core ones
+        qname = etree.QName(child)
+        name = qname.localname if qname.namespace in _FEED_NAMESPACES else child.tag
+        if name == "link":
+            # Atom links carry the URL in href, prefer the alternate one
+            href = child.get("href")
+            if href is None:
+                entry["link"] = (child.text or "").strip()
+            elif "link" not in entry or child.get("rel", "alternate") == "alternate":
+                entry["link"] = href
+        elif name == "guid" and child.get("isPermaLink", "true") == "true":
+            permalink = (child.text or "").strip()
+        elif name in _ENTRY_FIELDS and _ENTRY_FIELDS[name] not in entry:
+            entry[_ENTRY_FIELDS[name]] = "".join(child.itertext()).strip()
+    
+    # Like feedparser, fall back to a permalink guid for items without a link
+    if permalink and not entry.get("link"):
+        entry["link"] = permalink
+    
+    entry["published_parsed"] = _parse_date(entry.pop("published", None))
+    entry["updated_parsed"] = _parse_date(entry.pop("updated", None))
+    return entry
+
+def cutoff_timestamp(now):
+    """
+    Oldest accepted publish time as a UTC epoch, so entries are filtered with an integer compare
+    
+    Args:
+        now: Current time (timezone-aware), the end of the time window
+        
+    Returns:
+        Epoch seconds of the start of the time window
+    """
+    return calendar.timegm(now.utctimetuple()) - int(TIME_WINDOW.total_seconds())
+
+def _is_stale(entry, cutoff_ts):
+    """
+    Check whether an entry was published before the cutoff, undated entries are kept
+    """
+    if cutoff_ts is None:
+        return False
+    date_struct = entry.get("published_parsed") or entry.get("updated_parsed")
+    return date_struct is not None and calendar.timegm(date_struct) < cutoff_ts
+
+def parse_feed_fast(content, cutoff_ts=None):
+    """
+    Parse RSS 2.0, RSS 1.0 and Atom entries with a streaming lxml parser
+    
+    Args:
+        content: Raw feed content as bytes
+        cutoff_ts: If given, entries published before this UTC epoch are dropped
+        
+    Returns:
+        Dict with the list of parsed entries and the number of entries in the feed
+    """
+    entries = []
+    entry_count = 0
+    for _, element in etree.iterparse(io.BytesIO(content), events=("end",),
+                                      tag=("{*}item", "{*}entry"), resolve_entities=False):
+        entry_count += 1
+        entry = _parse_entry(element)
+        if not _is_stale(entry, cutoff_ts):
+            entries.append(entry)
+        
+        # Free parsed elements to keep memory constant
+        element.clear()
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+    
+    return {"entries": entries, "entry_count": entry_count}
+
+def parse_feed(content, cutoff_ts=None):
+    """
+    Parse raw feed content, meant to run in a worker process
+    
+    Uses the lxml parser and falls back to feedparser for malformed feeds.
+    Old entries are dropped in the worker so they are never sent back.
+    
+    Args:
+        content: Raw feed content
+        cutoff_ts: If given, entries published before this UTC epoch are dropped
+        
+    Returns:
+        Parsed feed data
+    """
+    try:
+        return parse_feed_fast(content, cutoff_ts)
+    except (etree.LxmlError, ValueError) as e:
+        logging.debug(f"lxml could not parse feed ({e}), falling back to feedparser")
+    
+    feed_data = feedparser.parse(content)
+    feed_data['entry_count'] = len(feed_data['entries'])
+    feed_data['entries'] = [entry for entry in feed_data['entries'] if not _is_stale(entry, cutoff_ts)]
+    
+    # XML parser exceptions do not always survive pickling back to the caller
+    if feed_data.get('bozo_exception'):
+        feed_data['bozo_exception'] = str(feed_data['bozo_exception'])
+    
+    return feed_data
+
+class AdaptiveLimiter:
+    """
+    Concurrency limit adjusted with AIMD: it grows by one while the mean
+    latency of recent fetches stays under the target, and is halved when
+    a server rate limits us or a fetch times out. Like TCP, it is halved
+    at most once per window: fetches started before the last decrease
+    already ran under the old limit, so their overload reports are ignored.
+    
+    Used as an async context manager, like asyncio.Semaphore.
+    """
+    
+    def __init__(self, initial, minimum, maximum, target_latency, window=32):
+        self.limit = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self._latencies = deque(maxlen=window)
+        self._decreased_at = float("-inf")
+        self._overloaded = set()
+        self._in_flight = 0
+        self._waiters = deque()
+    
+    async def __aenter__(self):
+        while self._in_flight >= self.limit:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # Hand a wake-up we already received on to the next waiter
+                if waiter.done() and not waiter.cancelled():
+                    self._wake()
+                raise
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        self._in_flight += 1
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        self._in_flight -= 1
+        self._wake()
+    
+    def _wake(self):
+        """
+        Wake as many waiters as there are free slots
+        """
+        free = self.limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+    
+    def record_latency(self, latency):
+        """
+        Additive increase while fetches are fast
+        """
+        self._latencies.append(latency)
+        if sum(self._latencies) / len(self._latencies) <= self.target_latency and self.limit < self.maximum:
+            self.limit += 1
+            self._wake()
+    
+    def record_overload(self, key, started):
+        """
+        Multiplicative decrease on rate limiting or timeouts
+        
+        Args:
+            key: Feed URL of the overloaded fetch, each feed is counted once
+            started: time.monotonic() at which the overloaded fetch started
+        """
+        if key in self._overloaded:
+            return
+        self._overloaded.add(key)
+        
+        if started < self._decreased_at:
+            return
+        
+        self.limit = max(self.minimum, self.limit // 2)
+        self._decreased_at = time.monotonic()
+        self._latencies.clear()
+        logging.info(f"Lowering concurrent feed fetches to {self.limit}")
+
+def _load_cache(path):
+    """
+    Load a JSON cache file, or an empty cache if it is missing or unreadable
+    """
+    try:
+        with open(path, "rb") as file:
+            return orjson.loads(file.read())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logging.warning(f"Could not load cache {path}, starting empty: {e}")
+        return {}
+
+def _save_cache(path, data):
+    """
+    Write a JSON cache file
+    """
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(orjson.dumps(data))
+    except Exception as e:
+        logging.warning(f"Could not save cache {path}: {e}")
+
+def load_feed_caches():
+    """
+    Load the feed validators and failures saved by the previous run
+    """
+    global ETAGS, FAIL_CACHE
+    ETAGS = _load_cache(ETAG_CACHE_FILE)
+    FAIL_CACHE = _load_cache(FAIL_CACHE_FILE)
+
+def save_feed_caches():
+    """
+    Persist the feed validators and failures for the next run
+    """
+    _save_cache(ETAG_CACHE_FILE, ETAGS)
+    _save_cache(FAIL_CACHE_FILE, FAIL_CACHE)
+
+def record_feed_failure(feed_url):
+    """
+    Skip a failing feed for a while, doubling the wait on consecutive failures
+    """
+    previous = FAIL_CACHE.get(feed_url)
+    backoff = min(previous["backoff"] * 2, FAIL_MAX_BACKOFF) if previous else FAIL_BACKOFF
+    # Wall-clock time, the cache outlives the process
+    FAIL_CACHE[feed_url] = {"until": time.time() + backoff, "backoff": backoff}
+
+def normalize_feed_url(feed_url):
+    """
+    Fix common URL issues: upgrade to HTTPS, except for feeds.* hosts
+    
+    Args:
+        feed_url: URL of the RSS feed from the configuration
+        
+    Returns:
+        URL to fetch
+    """
+    if feed_url.startswith("http://") and not feed_url.startswith("http://feeds."):
+        return "https://" + feed_url[len("http://"):]
+    return feed_url
+
+def retry_delay(attempt, retry_after=None):
+    """
+    Seconds to wait before the next attempt, honoring Retry-After when the server sent one
+    
+    Args:
+        attempt: Number of the attempt that just failed
+        retry_after: Value of the Retry-After response header, if any
+        
+    Returns:
+        Delay in seconds
+    """
+    if retry_after:
+        if retry_after.isdigit():
+            return float(retry_after)
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+    
+    # Exponential backoff with jitter
+    return min(2 ** attempt + random.random(), MAX_RETRY_DELAY)
+
+async def fetch_feed(session, source_name, feed_url, cutoff_ts=None, limiter=None, parse_pool=None,
+                     host_semaphore=None, attempt=1):
     """
     Fetch and parse an RSS feed from the given URL with retry logic
     
+    A slot of host_semaphore and of the limiter is only held while the
+    feed is downloaded; parsing and waits between retries happen outside.
+    
     Args:
         session: aiohttp ClientSession
         source_name: Name of the news source
-        feed_url: URL of the RSS feed
+        feed_url: URL of the RSS feed, as returned by normalize_feed_url
+        cutoff_ts: If given, entries published before this UTC epoch are dropped while parsing
+        limiter: AdaptiveLimiter bounding concurrent downloads, reported latencies and overload to
+        parse_pool: Executor to parse the feed in, the event loop's default executor if None
+        host_semaphore: asyncio.Semaphore bounding concurrent downloads from the feed's host
         attempt: Current attempt number
         
     Returns:
         Tuple of (source_name, feed_data)
     """
-    # Fix common URL issues
-    if feed_url.startswith("http://") and not feed_url.startswith("http://feeds."):
-        feed_url = feed_url.replace("http://", "https://", 1)
+    # Skip feeds that failed recently
+    failure = FAIL_CACHE.get(feed_url)
+    if failure and time.time() < failure["until"]:
+        logging.info(f"Skipping {feed_url}, failing recently (backoff {failure['backoff']}s)")
+        return source_name, None
     
-    # Select a random user agent
-    headers = {
-        "User-Agent": random.choice(USER_AGENTS),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Referer": "https://www.google.com/"  # Sometimes helps with access
-    }
+    # Ask the server to skip the body if the feed hasn't changed since the last run
+    validators = ETAGS.get(feed_url, {})
+    conditional_headers = {}
+    if validators.get("etag"):
+        conditional_headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        conditional_headers["If-Modified-Since"] = validators["last_modified"]
     
+    delay = None
     try:
-        # Fetch the feed with timeout and headers
-        async with session.get(feed_url, headers=headers, timeout=8) as response:
-            if response.status != 200:
-                if attempt < 2:  # Retry once
-                    logging.warning(f"Retrying {feed_url} after {response.status} error (attempt {attempt})")
-                    await asyncio.sleep(1)  # Wait a bit before retry
-                    return await fetch_feed(session, source_name, feed_url, attempt + 1)
-                else:
-                    logging.error(f"Error fetching {feed_url}: HTTP status {response.status}")
-                    return source_name, None
-            
-            content = await response.text()
-            
-            # Parse the feed with feedparser
-            feed_data = feedparser.parse(content)
-            
-            # Check if the feed is valid
-            if feed_data.get('bozo_exception'):
-                logging.warning(f"Warning parsing {feed_url}: {feed_data.get('bozo_exception')}")
-            
-            if not feed_data.get('entries'):
-                logging.warning(f"No entries found in {feed_url}")
-            
-            return source_name, feed_data
+        # Take the host slot first so tasks queued on a busy host don't hold global slots
+        async with host_semaphore or contextlib.nullcontext(), limiter or contextlib.nullcontext():
+            # Latency is measured from the moment the slots are taken
+            start_time = time.monotonic()
+            # Hard budget for the whole download (connect, headers and body) on top of the session timeout
+            async with asyncio.timeout(FEED_TIMEOUT):
+                # Fetch the feed, timeout and default headers come from the session
+                async with session.get(feed_url, headers=conditional_headers) as response:
+                    if response.status == 304:
+                        # A fast 304 is a healthy response too, the limiter needs it to grow
+                        if limiter:
+                            limiter.record_latency(time.monotonic() - start_time)
+                        logging.info(f"{feed_url} not modified since last run")
+                        FAIL_CACHE.pop(feed_url, None)
+                        return source_name, None
+                    
+                    if response.status != 200:
+                        if limiter and response.status in (429, 503):
+                            limiter.record_overload(feed_url, start_time)
+                        
+                        # Only rate limiting and gateway errors are worth retrying
+                        if response.status in RETRY_STATUSES and attempt < MAX_ATTEMPTS:
+                            delay = retry_delay(attempt, response.headers.get("Retry-After"))
+                        
+                        if delay is None or delay > MAX_RETRY_AFTER:
+                            logging.error(f"Error fetching {feed_url}: HTTP status {response.status}")
+                            record_feed_failure(feed_url)
+                            return source_name, None
+                        
+                        logging.warning(f"Retrying {feed_url} in {delay:.1f}s after {response.status} error (attempt {attempt})")
+                    else:
+                        # Keep the raw bytes, the parsers detect the encoding from the XML prolog
+                        content = await response.read()
+                        if limiter:
+                            limiter.record_latency(time.monotonic() - start_time)
+                        
+                        etag = response.headers.get("ETag")
+                        last_modified = response.headers.get("Last-Modified")
     
-    except asyncio.TimeoutError:
-        if attempt < 2:  # Retry once on timeout
-            logging.warning(f"Retrying {feed_url} after timeout (attempt {attempt})")
-            await asyncio.sleep(1)  # Wait a bit before retry
-            return await fetch_feed(session, source_name, feed_url, attempt + 1)
-        else:
-            logging.error(f"Timeout fetching {feed_url}")
+    except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+        if limiter and isinstance(e, asyncio.TimeoutError):
+            limiter.record_overload(feed_url, start_time)
+        
+        if attempt >= MAX_ATTEMPTS:
+            logging.error(f"Error fetching {feed_url}: {e!r}")
+            record_feed_failure(feed_url)
             return source_name, None
+        
+        delay = retry_delay(attempt)
+        logging.warning(f"Retrying {feed_url} in {delay:.1f}s after {e!r} (attempt {attempt})")
     except Exception as e:
-        logging.error(f"Error fetching {feed_url}: {e}")
+        # Local faults say nothing about the feed, so it isn't recorded as failing
+        logging.error(f"Error processing {feed_url}: {e!r}")
         return source_name, None
+    
+    if delay is not None:
+        # Wait outside the request so the connection and the slots are released in the meantime
+        await asyncio.sleep(delay)
+        return await fetch_feed(session, source_name, feed_url, cutoff_ts, limiter, parse_pool,
+                                host_semaphore, attempt + 1)
+    
+    # Parse in the process pool so parsing overlaps with downloads. This is outside the
+    # slots and the hard timeout: a parse slowed down by CPU load says nothing about the
+    # host, so it must neither block other downloads, lower the limit nor trigger a new download.
+    try:
+        loop = asyncio.get_running_loop()
+        feed_data = await loop.run_in_executor(parse_pool, parse_feed, content, cutoff_ts)
+    except Exception as e:
+        logging.error(f"Error parsing {feed_url}: {e!r}")
+        return source_name, None
+    
+    # Check if the feed is valid
+    if feed_data.get('bozo_exception'):
+        logging.warning(f"Warning parsing {feed_url}: {feed_data.get('bozo_exception')}")
+    
+    if not feed_data.get('entry_count'):
+        logging.warning(f"No entries found in {feed_url}")
+    
+    # Remember validators only once the feed was parsed
+    if etag or last_modified:
+        ETAGS[feed_url] = {"etag": etag, "last_modified": last_modified}
+    else:
+        ETAGS.pop(feed_url, None)
+    
+    FAIL_CACHE.pop(feed_url, None)
+    return source_name, feed_data
 
-def filter_recent_news(source_name, feed_data):
+async def fetch_feed_bounded(limiter, host_semaphores, session, source_name, feed_url, cutoff_ts=None, parse_pool=None):
     """
-    Filter news items that are within the recent time window (1 hour)
+    Fetch a feed while bounding downloads with the global limiter and the per-host semaphore
+    
+    Waiting happens on these rather than in the connector pool, so the request
+    timeout only starts once a connection can actually be opened.
     
     Args:
+        limiter: AdaptiveLimiter bounding concurrent fetches
+        host_semaphores: Mapping of host to asyncio.Semaphore bounding fetches per host
+        session: aiohttp ClientSession
         source_name: Name of the news source
-        feed_data: Parsed feed data from feedparser
+        feed_url: URL of the RSS feed
+        cutoff_ts: If given, entries published before this UTC epoch are dropped while parsing
+        parse_pool: Executor to parse the feed in
         
     Returns:
-        List of recent news items
+        Tuple of (feed_url, feed_data)
+    """
+    host_semaphore = host_semaphores[urlparse(feed_url).netloc]
+    _, feed_data = await fetch_feed(session, source_name, feed_url, cutoff_ts, limiter, parse_pool, host_semaphore)
+    return feed_url, feed_data
+
+def filter_recent_news(source_name, feed_data, now):
+    """
+    Yield news items that are within the recent time window (1 hour)
+    
+    Args:
+        source_name: Name of the news source
+        feed_data: Parsed feed data from parse_feed
+        now: Current time (timezone-aware), the end of the time window
+        
+    Yields:
+        Recent news items
     """
     if not feed_data or "entries" not in feed_data:
-        return []
+        return
+    
+    cutoff_ts = cutoff_timestamp(now)
     
-    recent_news = []
-    for entry in feed_data.entries:
+    for entry in feed_data["entries"]:
         try:
             # Get the published date
             date_struct = entry.get("published_parsed") or entry.get("updated_parsed")
             
             if date_struct:
-                # Convert struct_time to datetime
-                published_date = datetime(*date_struct[:6], tzinfo=timezone.utc)
+                # Skip entries outside the time window before building anything
+                published_ts = calendar.timegm(date_struct)
+                if published_ts < cutoff_ts:
+                    continue
                 
-                # Check if within time window
-                if now - published_date <= TIME_WINDOW:
-                    # Create news item
-                    news_item = {
-                        "source": source_name,
-                        "title": entry.get("title", "No Title"),
-                        "link": entry.get("link", ""),
-                        "published": published_date.isoformat(),
-                        "summary": entry.get("summary", "") or entry.get("description", "No Summary"),
-                        "location": None
-                    }
-                    
-                    # Clean up summary by removing HTML tags (simple method)
-                    summary = news_item["summary"]
-                    summary = summary.replace("<p>", "").replace("</p>", " ")
-                    summary = summary.replace("<br>", " ").replace("<br/>", " ")
-                    news_item["summary"] = summary
-                    
-                    recent_news.append(news_item)
+                published = datetime.fromtimestamp(published_ts, timezone.utc)
             else:
                 # For financial news, we're strict about dates
                 # If no date, use current time but log a warning
                 logging.warning(f"No date for entry from {source_name}, using current time")
-                
-                news_item = {
-                    "source": source_name,
-                    "title": entry.get("title", "No Title"),
-                    "link": entry.get("link", ""),
-                    "published": now.isoformat(),  # Use current time
-                    "summary": entry.get("summary", "") or entry.get("description", "No Summary"),
-                    "location": None
-                }
-                
-                # Clean up summary
-                summary = news_item["summary"]
-                summary = summary.replace("<p>", "").replace("</p>", " ")
-                summary = summary.replace("<br>", " ").replace("<br/>", " ")
-                news_item["summary"] = summary
-                
-                recent_news.append(news_item)
-                
+                published = now
+            
+            # Create news item
+            news_item = {
+                "source": source_name,
+                "title": entry.get("title", "No Title"),
+                "link": entry.get("link", ""),
+                "published": published,
+                "summary": entry.get("summary", "") or entry.get("description", "No Summary"),
+                "location": None
+            }
+            
+            # Clean up summary by removing HTML tags
+            news_item["summary"] = _TAG_RE.sub(" ", news_item["summary"]).strip()
+            
+            yield news_item
+        
         except Exception as e:
             logging.error(f"Error parsing entry from {source_name}: {e}")
-    
-    return recent_news
 
 async def process_rss_feeds():
     """
@@ -173,53 +623,68 @@ async def process_rss_feeds():
     Returns:
         List of news items collected
     """
-    global news_list
-    news_list = []  # Reset news list
+    news_list = []
     
     try:
+        # Evaluated per run so a long-lived process keeps a correct time window
+        now = datetime.now(timezone.utc)
+        cutoff_ts = cutoff_timestamp(now)
+        
         # Load RSS sources configuration
-        with open("news/rss.json", "r", encoding="utf-8") as file:
-            rss_sources = json.load(file)
-        
-        # Create ClientSession with connection limit
-        conn = aiohttp.TCPConnector(limit=10)  # Limit concurrent connections
-        timeout = aiohttp.ClientTimeout(total=30)  # Overall timeout
-        
-        async with aiohttp.ClientSession(connector=conn, timeout=timeout) as session:
-            # Create tasks for all feeds
-            tasks = []
-            for source in rss_sources:
-                for _, feed_url in source["rss_feeds"].items():
-                    tasks.append(fetch_feed(session, source["source"], feed_url))
-            
-            # Execute all tasks concurrently
-            responses = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Filter out exceptions
-            valid_responses = []
-            for resp in responses:
-                if isinstance(resp, Exception):
-                    logging.error(f"Task error: {resp}")
-                else:
-                    valid_responses.append(resp)
-            
-            # Process feeds in parallel using ThreadPoolExecutor
-            with ThreadPoolExecutor() as executor:
-                filtered_news = list(executor.map(
-                    lambda x: filter_recent_news(x[0], x[1]), 
-                    valid_responses
-                ))
-            
-            # Flatten news lists
-            for group in filtered_news:
-                news_list.extend(group)
-            
-            logging.info(f"{len(news_list)} news collected within the last hour!")
+        rss_sources = orjson.loads(RSS_SOURCES_FILE.read_bytes())
+        
+        load_feed_caches()
+        
+        # Create ClientSession with connection limits, DNS caching and keep-alive reuse
+        conn = aiohttp.TCPConnector(
+            limit=128,  # Limit concurrent connections
+            limit_per_host=MAX_FEEDS_PER_HOST,  # Don't hammer a single source
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
+        
+        # Select a random user agent for this run
+        headers = {**DEFAULT_HEADERS, "User-Agent": random.choice(USER_AGENTS)}
+        
+        # Parse feeds in worker processes that live only for this run
+        parse_context = multiprocessing.get_context(PARSE_START_METHOD)
+        with ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=parse_context) as parse_pool:
+            async with aiohttp.ClientSession(connector=conn, timeout=REQUEST_TIMEOUT, headers=headers) as session:
+                # Create tasks for all feeds, with an adaptive number (at most MAX_FEEDS_PER_HOST per host) in flight
+                limiter = AdaptiveLimiter(INITIAL_CONCURRENT_FEEDS, MIN_CONCURRENT_FEEDS,
+                                          MAX_CONCURRENT_FEEDS, TARGET_LATENCY)
+                host_semaphores = defaultdict(lambda: asyncio.Semaphore(MAX_FEEDS_PER_HOST))
+                
+                # Fetch each feed URL once, even if several sources list it
+                url_to_sources = defaultdict(list)
+                for source in rss_sources:
+                    for _, feed_url in source["rss_feeds"].items():
+                        source_names = url_to_sources[normalize_feed_url(feed_url)]
+                        if source["source"] not in source_names:
+                            source_names.append(source["source"])
+                
+                tasks = []
+                for feed_url, source_names in url_to_sources.items():
+                    tasks.append(fetch_feed_bounded(limiter, host_semaphores, session, source_names[0], feed_url, cutoff_ts, parse_pool))
+                
+                # Filter each feed as soon as it is parsed instead of waiting for the slowest one
+                for task in asyncio.as_completed(tasks):
+                    try:
+                        feed_url, feed_data = await task
+                    except Exception as e:
+                        logging.error(f"Task error: {e}")
+                        continue
+                    
+                    for source_name in url_to_sources[feed_url]:
+                        news_list.extend(filter_recent_news(source_name, feed_data, now))
+                
+                logging.info(f"{len(news_list)} news collected within the last hour!")
+        
+        save_feed_caches()
     
     except Exception as e:
         logging.error(f"Error in process_rss_feeds: {e}")
     
-    # Important: Return the news_list explicitly, not just rely on global variable
     return news_list
 
 if __name__ == "__main__":